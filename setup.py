@@ -27,7 +27,7 @@ setup(
     install_requires=[
         'pyttsx',
         'metar',
-        'aviationFormula',
+        'numpy',
         ],
     
     classifiers=[
@@ -56,22 +56,14 @@ class AudioProcessing(object):
 
 	def set_echo(self, delay):
 		'''Applies an echo that is 0...<input audio duration in seconds> seconds from the beginning'''
-		output_audio = np.zeros(len(self.audio_data))
 		output_delay = delay * self.sample_freq
 
-		for count, e in enumerate(self.audio_data):
-			output_audio[count] = e + self.audio_data[count - int(output_delay)]
-
-		self.audio_data = output_audio
+		# Each sample gets the sample <delay> earlier added (wrapping around at the start).
+		self.audio_data = self.audio_data.astype(float) + np.roll(self.audio_data, int(output_delay), axis=0)
 
 	def set_volume(self, level):
 		'''Sets the overall volume of the data via floating-point factor'''
-		output_audio = np.zeros(len(self.audio_data))
-
-		for count, e in enumerate(self.audio_data):
-			output_audio[count] = (e * level)
-
-		self.audio_data = output_audio
+		self.audio_data = self.audio_data.astype(float) * level
 
 	def set_reverse(self):
 		'''Reverses the audio'''
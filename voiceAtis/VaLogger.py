@@ -65,7 +65,7 @@ class VaLogger(object):
                     os.makedirs(self.logDir)
                 with open(self.logFile,'w'):
                     os.utime(self.logFile, None)
-            except:
+            except OSError:
                 self.logFile = None
         
         # Init color.
@@ -136,6 +136,7 @@ class VaLogger(object):
             (bufx, bufy, curx, cury, wattr,                                                 # @UnusedVariable
             left, top, right, bottom, maxx, maxy) = struct.unpack("hhhhHhhhhhh", csbi.raw)  # @UnusedVariable
             self.colorReset = wattr
-        except:
+        except (AttributeError, AssertionError, OSError):
+            # No windows console available.
             self.colorHandle = None
             self.colorReset = None
\ No newline at end of file
@@ -66,23 +66,33 @@
 # Import built-ins
 import os
 import re
-import sys
 import time
+import io
+import csv
 import json
+import gzip
 import urllib.request
+import urllib.error
+import http.client
 from math import floor
 import warnings
 from datetime import datetime
 import wave
 import contextlib
+import hashlib
+import pickle
+from collections import OrderedDict
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Optional
 
 # Import pip packages.
+import numpy as np
 import tts.sapi
 from fsuipc import FSUIPC, FSUIPCException
 from AudioEffect import AudioEffect
 from pygame import mixer
 from metar.Metar import Metar
-from aviationFormula.aviationFormula import gcDistanceNm
 
 # Import own packages.
 from VaLogger import VaLogger
@@ -110,12 +120,115 @@ print(' ')
 # Set encoding type.
 ENCODING_TYPE = 'utf-8'
 
+# Bound formatter of an airports.info line: code; frequencies; lat; lon; name.
+AIRPORT_INFO_FORMAT = '{:>4}; {:20}; {:11.6f}; {:11.6f}; {}\n'.format
+
+# Runway side chars with their index and name in IvAc 2 runway information.
+RWY_SIDES = {'L': (1, 'Left'), 'C': (2, 'Center'), 'R': (3, 'Right')}
+
+# Buffer size for large downloads and data files.
+IO_BUFFER_SIZE = 256 * 1024
+
+# Timeout of all downloads.
+URL_TIMEOUT = 30  # seconds
+
+# Upper bound for the length of a metar line.
+METAR_MAX_LEN = 512
+
+# Precompiled patterns. ATIS text is plain ASCII, so skip the unicode tables.
+ATIS_LETTER_RE = re.compile(r'(?<=ATIS )[A-Z](?= \d{4})', re.ASCII)
+RWY_NUMBER_RE = re.compile(r'\d{2}', re.ASCII)
+REPORT_TIME_RE = re.compile(r'\d{4}z', re.ASCII)
+RVR_RE = re.compile(r'[0123]\d[LCR]?(?=,)', re.ASCII)
+AIRPORT_FILE_SPLIT_RE = re.compile('[,;]')
+
+
+# Parse a metar string.
+# Results are cached, an unchanged metar is not parsed again.
+@lru_cache(maxsize=128)
+def parse_metar_string(metar_string):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return Metar(metar_string, strict=False)
+
+
+# Great circle distance in nautical miles from one point to arrays of points.
+# Vectorized version of gcDistanceNm from aviationFormula.
+def gc_distance_nm_vec(lat1, lon1, lat2, lon2):
+    lat1 = np.radians(lat1)
+    lon1 = np.radians(lon1)
+    lat2 = np.radians(lat2)
+    lon2 = np.radians(lon2)
+    distance = 2 * np.arcsin(np.sqrt(np.sin((lat1 - lat2) / 2) ** 2
+                                     + np.cos(lat1) * np.cos(lat2) * np.sin((lon1 - lon2) / 2) ** 2))
+    return ((180 * 60) / np.pi) * distance
+
+
+# Convert a FSUIPC BCD frequency word to MHz.
+# Example: 0x2280 > 122.8
+def bcd_to_frequency(value):
+    digits = ((value >> 12) & 0xF) * 1000 + ((value >> 8) & 0xF) * 100 + ((value >> 4) & 0xF) * 10 + (value & 0xF)
+    return (10000 + digits) / 100
+
+
+# Get runway number and sides of an IvAc 2 runway line.
+# Example: 'ARR RWY 26L/R' > ['26', 'Left', None, 'Right']
+def parse_rwy_sides(rwy_line):
+    cur_rwy = [rwy_line[8:10], None, None, None]
+    sides = set(rwy_line[8:])
+    for side, (index, name) in RWY_SIDES.items():
+        if side in sides:
+            cur_rwy[index] = name
+    return cur_rwy
+
+
+# Voice string of a runway designator.
+# Example: '26L' > '2 6 left'
+def parse_voice_rwy_designator(rwy_raw):
+    if len(rwy_raw) > 2:
+        return f'{parseVoiceInt(rwy_raw[0:2])} {RWY_TABLE[rwy_raw[2]]}'
+    return parseVoiceInt(rwy_raw)
+
+
+# Voice string of a runway matched by RVR_RE.
+def parse_voice_rvr_rwy(match):
+    return parse_voice_rwy_designator(match.group())
+
+
+# Convert runway information to nested tuples, so it can't be changed once stored.
+# ARR and DEP are lists of runways, IvAc 2 runways are lists themselves. TRL and TA are strings.
+def freeze_rwy_information(rwy_information):
+    frozen = []
+    for info in rwy_information:
+        if isinstance(info, list):
+            runways = []
+            for rw in info:
+                if isinstance(rw, list):
+                    rw = tuple(rw)
+                runways.append(rw)
+            info = tuple(runways)
+        frozen.append(info)
+    return tuple(frozen)
+
+
+# Tokenized content of a raw ATIS.
+@dataclass(frozen=True)
+class ParsedAtis:
+    atis_raw: tuple
+    client_type: str
+    information_identifier: str
+    metar_string: Optional[str]
+    rwy_information: tuple
+
 
 # Main Class of VoiceAtis.
 # Run constructor to run the program.
 class VoiceAtis(object):
     STATION_SUFFIXES_DEP = ['DEL', 'GND', 'TWR', 'DEP', 'APP']
     STATION_SUFFIXES_ARR = ['APP', 'TWR', 'GND', 'DEL', 'DEP']
+    # Preference rank of each suffix, lower is preferred.
+    STATION_RANK_DEP = {su: k for k, su in enumerate(STATION_SUFFIXES_DEP)}
+    STATION_RANK_ARR = {su: k for k, su in enumerate(STATION_SUFFIXES_ARR)}
 
     SPEECH_RATE = 150
 
@@ -123,6 +236,8 @@ class VoiceAtis(object):
 
     RADIO_RANGE = 180  # nm
 
+    WAV_CACHE_SIZE = 5  # generated ATIS sounds kept in tmp
+
     OFFSETS = [(0x034E, 'H'),  # com1freq
                (0x3118, 'H'),  # com2freq
                (0x3122, 'b'),  # radioActive
@@ -139,6 +254,7 @@ class VoiceAtis(object):
     WHAZZUP_INTERVAL = 30  # seconds
 
     NOAA_METAR_URL = 'http://tgftp.nws.noaa.gov/data/observations/metar/stations/<station>.TXT'
+    METAR_INTERVAL = 60  # seconds
 
     OUR_AIRPORTS_URL = 'http://ourairports.com/data/'
 
@@ -158,7 +274,7 @@ class VoiceAtis(object):
         self.fsuipc_offsets = None
         self.metar = None
         self.atis_voice = ''
-        self.whazzup_text = ''
+        self.whazzup_text = b''
 
         self.com1frequency = None
         self.com2frequency = None
@@ -173,9 +289,17 @@ class VoiceAtis(object):
         self.on_ground = True
 
         self.airport = None
+        self.last_radio_state = None
         self.airport_infos = {}
+        self.ap_codes = []
+        self.ap_lat = None
+        self.ap_lon = None
+        self.freq_to_airports = {}
         self.atc = []
+        self.station_index = {}
+        self.whazzup_validators = {}
         self.atis_raw = None
+        self.parsed_atis = None
         self.client_type = ''
         self.information_voice = ''
         self.information_identifier = ''
@@ -185,7 +309,12 @@ class VoiceAtis(object):
         self.comment_voice = ''
         self.currently_reading = ''
         self.wav_duration = None
+        self.wav_cache = OrderedDict()
+        self.metar_cache = {}
+        self.metar_validators = {}
+        self.metar_strings = {}
         self.ini_options = {}
+        self.last_ini_items = None
 
         # Process optional arguments.
         self.logLvl = optional.get('LogLevel', 'debug')
@@ -205,6 +334,7 @@ class VoiceAtis(object):
 
         # Read file with airport frequencies and coordinates.
         self.get_airport_data()
+        self.build_airport_arrays()
 
         # Init tts engine
         self.engine = tts.sapi.Sapi()
@@ -248,11 +378,14 @@ class VoiceAtis(object):
                     admin_message_sent = True
                 time.sleep(20)
 
+        # Bind loop functions to locals to avoid attribute lookups each cycle.
+        loop_run = self.loop_run
+        sleep = time.sleep
+
         # Infinite loop.
         try:
             while True:
-                time_sleep = self.loop_run()
-                time.sleep(time_sleep)
+                sleep(loop_run())
 
         except KeyboardInterrupt:
             # Actions at Keyboard Interrupt.
@@ -276,7 +409,13 @@ class VoiceAtis(object):
             return self.SLEEP_TIME
 
         # Get best suitable Airport.
-        self.get_airport()
+        # Skip the search if radios and position (~100 m) are unchanged since the last cycle.
+        radio_state = (self.com1frequency, self.com2frequency, self.nav1frequency, self.nav2frequency,
+                       self.com1active, self.com2active, self.nav1active, self.nav2active,
+                       round(self.lat, 3), round(self.lon, 3))
+        if radio_state != self.last_radio_state:
+            self.get_airport()
+            self.last_radio_state = radio_state
 
         # Handle if no airport found.
         if self.airport is None:
@@ -286,7 +425,8 @@ class VoiceAtis(object):
             self.logger.info('Airport: {}.'.format(self.airport))
 
         # Get atis voice.
-        self.get_atis_from_airport()
+        if not self.get_atis_from_airport():
+            return self.SLEEP_TIME
 
         # Read the string.
         self.read_voice()
@@ -359,6 +499,7 @@ class VoiceAtis(object):
         # return 0
 
     # With a determined airport, get atis_voice from whazzup data.
+    # Returns False if there is nothing to read.
     def get_atis_from_airport(self):
         # Get whazzup file
         self.get_whazzup_json()
@@ -370,26 +511,22 @@ class VoiceAtis(object):
         if self.atis_raw is not None:
             self.logger.info('Station found, decoding Atis.')
 
-            # Parse ATIS.
+            # Parse ATIS. Only tokenize again if the ATIS changed.
+            if (self.parsed_atis is None or self.parsed_atis.atis_raw != tuple(self.atis_raw)
+                    or self.parsed_atis.client_type != self.client_type):
+                self.parsed_atis = self.parse_atis()
+            self.information_identifier = self.parsed_atis.information_identifier
+            self.rwy_information = self.parsed_atis.rwy_information
+
             # Information.
-            self.get_info_identifier()
             self.parse_voice_information()
 
             # Metar.
-            if self.client_type == 'aurora':
-                self.parse_metar(self.atis_raw[3].strip())
-            if self.client_type == 'ivAc1':
-                self.parse_metar(self.atis_raw[2].strip())
-            else:
-                for ar in self.atis_raw:
-                    if ar.startswith('METAR'):
-                        self.parse_metar(ar.replace('METAR ', '').strip())
-                        break
-
+            if self.parsed_atis.metar_string is not None:
+                self.parse_metar(self.parsed_atis.metar_string)
             self.parse_voice_metar()
 
             # Runways / TRL / TA
-            self.parse_raw_rwy()
             self.parse_voice_rwy()
 
             # comment.
@@ -403,10 +540,11 @@ class VoiceAtis(object):
         else:
             # Actions, if no station online.
             self.logger.info('No station online, using metar only.')
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                # TODO: Get metar from a different source. (not API v1)
-                self.metar = Metar(self.get_airport_metar(), strict=False)
+            # TODO: Get metar from a different source. (not API v1)
+            metar_string = self.get_airport_metar()
+            if metar_string is None:
+                return False
+            self.parse_metar(metar_string)
 
             self.parse_voice_metar()
 
@@ -418,6 +556,8 @@ class VoiceAtis(object):
             self.atis_voice = '{} weather report time {} {}, {}.'.format(self.airport_infos[self.airport][3], hours,
                                                                          minutes, self.metar_voice)
 
+        return True
+
     # Downloads and reads the whazzup from IVAO
     def get_whazzup_json(self):
         # Check if last download was more than 5 min ago.
@@ -427,16 +567,83 @@ class VoiceAtis(object):
 
         # Get file from api.
         self.logger.info('Downloading new ATIS data.')
-        with urllib.request.urlopen(self.WHAZZUP_URL) as response:  # , open('whazzup.txt.gz', 'wb') as out_file:
-            self.whazzup_text = response.read().decode("ISO-8859-1")
+        response = self.urlopen_conditional(self.WHAZZUP_URL, self.whazzup_validators, {'Accept-Encoding': 'gzip'})
+        if response is None:
+            self.logger.info('ATIS data not modified since last download.')
+            self.last_whazzup_download_time = time.time()
+            return
+
+        with response:
+            # Decompress while downloading if the server sent gzip.
+            # Kept as bytes, json decodes them itself without an intermediate str copy.
+            if response.headers.get('Content-Encoding') == 'gzip':
+                with gzip.GzipFile(fileobj=io.BufferedReader(response, IO_BUFFER_SIZE)) as gzip_file:
+                    self.whazzup_text = gzip_file.read()
+            else:
+                self.whazzup_text = self.read_response(response)
 
         # Parse json and get atc data.
         json_loads = json.loads(self.whazzup_text)
         self.atc = json_loads['clients']['atcs']
 
-        # shutil.copyfileobj(response, out_file)
+        # Index stations by airport code (callsign prefix).
+        self.station_index = {}
+        for st in self.atc:
+            self.station_index.setdefault(st['callsign'].partition('_')[0], []).append(st)
+
+        self.store_validators(response, self.whazzup_validators)
         self.last_whazzup_download_time = time.time()
 
+    # Opens an url with a conditional GET.
+    # validators holds ETag and Last-Modified of the last successfully read response, see store_validators.
+    # Returns None if the resource was not modified since (HTTP 304).
+    @staticmethod
+    def urlopen_conditional(url, validators, headers=None):
+        headers = dict(headers or {})
+        if validators.get('ETag'):
+            headers['If-None-Match'] = validators['ETag']
+        if validators.get('Last-Modified'):
+            headers['If-Modified-Since'] = validators['Last-Modified']
+
+        try:
+            response = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=URL_TIMEOUT)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                e.close()
+                return None
+            raise
+
+        return response
+
+    # Keep ETag and Last-Modified of a response for the next conditional GET.
+    # Only call after the body was read and processed successfully.
+    @staticmethod
+    def store_validators(response, validators):
+        validators['ETag'] = response.headers.get('ETag')
+        validators['Last-Modified'] = response.headers.get('Last-Modified')
+
+    # Reads a complete response.
+    # If the length is known, the body is read into one preallocated buffer without intermediate copies.
+    @staticmethod
+    def read_response(response):
+        length = response.headers.get('Content-Length')
+        if length is None:
+            return response.read()
+
+        buffer = bytearray(int(length))
+        view = memoryview(buffer)
+        pos = 0
+        while pos < len(buffer):
+            n_read = response.readinto(view[pos:])
+            if not n_read:
+                break
+            pos += n_read
+        view.release()
+
+        if pos < len(buffer):
+            del buffer[pos:]
+        return buffer
+
     # Find a station of the airport and read the ATIS string.
     def parse_whazzup_text(self):
         # Check if data is available.
@@ -447,38 +654,33 @@ class VoiceAtis(object):
         # Find an open station.
         # Get preferred station order.
         if self.on_ground:
-            station_suffixes = self.STATION_SUFFIXES_DEP
+            suffix_rank = self.STATION_RANK_DEP
         else:
-            station_suffixes = self.STATION_SUFFIXES_ARR
-
-        # Search for fitting stations.
-        stations_avail = []
-        for st in self.atc:
-            if st['callsign'].startswith(self.airport):
-                stations_avail.append(st)
-                if st['callsign'].endswith(station_suffixes[0]):
-                    # Finish the search, if the preferred station was found.
-                    break
+            suffix_rank = self.STATION_RANK_ARR
 
-        # Get the preferred station from available stations.
+        # Search for the preferred station in a single pass over the stations of the airport.
         station_chosen = None
-        for su in station_suffixes:
-            for st in stations_avail:
-                if st['callsign'].endswith(su):
-                    station_chosen = st
+        rank_chosen = len(suffix_rank)
+        for st in self.station_index.get(self.airport, ()):
+            callsign = st['callsign']
+            rank = suffix_rank.get(callsign[callsign.rfind('_') + 1:], rank_chosen)
+            if rank < rank_chosen:
+                station_chosen = st
+                rank_chosen = rank
+                if rank == 0:
+                    # Finish the search, if the preferred station was found.
                     break
-            # Exit loop if a station was chosen.
-            if station_chosen is not None:
-                break
 
         # Get atis from chosen station.
         if station_chosen is not None:
             self.atis_raw = station_chosen['atis']['lines']
-            if station_chosen['softwareTypeId'] == 'aurora':
+            software_type = station_chosen['softwareTypeId']
+            software_version = station_chosen['softwareVersion']
+            if software_type == 'aurora':
                 self.client_type = 'aurora'
-            elif station_chosen['softwareTypeId'] == 'ivAc' and station_chosen['softwareVersion'].startswith('1'):
+            elif software_type == 'ivAc' and software_version.startswith('1'):
                 self.client_type = 'ivac1'
-            elif station_chosen['softwareTypeId'] == 'ivAc' and station_chosen['softwareVersion'].startswith('2'):
+            elif software_type == 'ivAc' and software_version.startswith('2'):
                 self.client_type = 'ivac2'
             else:
                 self.client_type = 'other'
@@ -486,10 +688,32 @@ class VoiceAtis(object):
         else:
             self.atis_raw = None
 
+    # Tokenize the raw ATIS once.
+    # Returns a ParsedAtis with information identifier, metar and runway information.
+    def parse_atis(self):
+        # Information.
+        self.get_info_identifier()
+
+        # Metar.
+        metar_string = None
+        if self.client_type == 'aurora':
+            metar_string = self.atis_raw[3].strip()
+        if self.client_type == 'ivAc1':
+            metar_string = self.atis_raw[2].strip()
+        else:
+            for ar in self.atis_raw:
+                if ar.startswith('METAR'):
+                    metar_string = ar.replace('METAR ', '').strip()
+                    break
+
+        # Runways / TRL / TA
+        self.parse_raw_rwy()
+
+        return ParsedAtis(tuple(self.atis_raw), self.client_type, self.information_identifier, metar_string,
+                          freeze_rwy_information(self.rwy_information))
+
     def parse_metar(self, metar_string):
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            self.metar = Metar(metar_string, strict=False)
+        self.metar = parse_metar_string(metar_string)
 
     # Parse runway and transition data.
     # Get active runways for arrival and departure.
@@ -522,7 +746,7 @@ class VoiceAtis(object):
 
                 # Find rwy numbers.
                 rwy_pos = []
-                for rw in re.finditer(r'\d{2}', part_str):
+                for rw in RWY_NUMBER_RE.finditer(part_str):
                     rwy_pos.append(rw.start())
                 rwy_pos.append(len(part_str))
 
@@ -555,127 +779,99 @@ class VoiceAtis(object):
                     self.rwy_information[3] = trl_ta_split[0].replace('TA ', '')
                     self.rwy_information[2] = trl_ta_split[1].replace('TRL', '')
 
-                elif ar.startswith('ARR'):
-                    cur_rwy = [ar[8:10], None, None, None]
-                    if 'L' in ar[8:]:
-                        cur_rwy[1] = 'Left'
-                    if 'C' in ar[8:]:
-                        cur_rwy[2] = 'Center'
-                    if 'R' in ar[8:]:
-                        cur_rwy[3] = 'Right'
-                    if self.rwy_information[0] is None:
-                        self.rwy_information[0] = [cur_rwy]
+                elif ar.startswith('ARR') or ar.startswith('DEP'):
+                    if ar.startswith('ARR'):
+                        k_id = 0
                     else:
-                        self.rwy_information[0].append(cur_rwy)
-
-                elif ar.startswith('DEP'):
-                    cur_rwy = [ar[8:10], None, None, None]
-                    if 'L' in ar[8:]:
-                        cur_rwy[1] = 'Left'
-                    if 'C' in ar[8:]:
-                        cur_rwy[2] = 'Center'
-                    if 'R' in ar[8:]:
-                        cur_rwy[3] = 'Right'
-                    if self.rwy_information[1] is None:
-                        self.rwy_information[1] = [cur_rwy]
+                        k_id = 1
+
+                    if self.rwy_information[k_id] is None:
+                        self.rwy_information[k_id] = [parse_rwy_sides(ar)]
                     else:
-                        self.rwy_information[1].append(cur_rwy)
+                        self.rwy_information[k_id].append(parse_rwy_sides(ar))
 
     # Generate a string of the metar for voice generation.
     def parse_voice_metar(self):
-        self.metar_voice = ''
+        metar_parts = []
+
+        # Bind metar groups used more than once to locals.
+        metar = self.metar
+        wind_speed = metar.wind_speed
+        wind_dir = metar.wind_dir
+        temp = metar.temp
+        dewpt = metar.dewpt
+        press = metar.press
 
         # Wind
-        if self.metar.wind_speed._value != 0:
-            if self.metar.wind_dir is not None:
-                self.metar_voice = '{}, wind {}, {}'.format(self.metar_voice,
-                                                            parseVoiceString(self.metar.wind_dir.string()),
-                                                            parseVoiceString(self.metar.wind_speed.string()))
+        if wind_speed._value != 0:
+            if wind_dir is not None:
+                metar_parts.append(f', wind {parseVoiceString(wind_dir.string())}, '
+                                   f'{parseVoiceString(wind_speed.string())}')
             else:
-                self.metar_voice = '{}, wind variable, {}'.format(self.metar_voice,
-                                                                  parseVoiceString(self.metar.wind_speed.string()))
+                metar_parts.append(f', wind variable, {parseVoiceString(wind_speed.string())}')
         else:
-            self.metar_voice = '{}, wind calm'.format(self.metar_voice, self.metar.wind_dir.string(),
-                                                      self.metar.wind_speed.string())
+            metar_parts.append(', wind calm')
 
-        if self.metar.wind_gust is not None:
-            self.metar_voice = '{}, maximum {}'.format(self.metar_voice,
-                                                       parseVoiceString(self.metar.wind_gust.string()))
+        if metar.wind_gust is not None:
+            metar_parts.append(f', maximum {parseVoiceString(metar.wind_gust.string())}')
 
-        if self.metar.wind_dir_from is not None:
-            self.metar_voice = '{}, variable between {} and {}'.format(self.metar_voice, parseVoiceString(
-                self.metar.wind_dir_from.string()), parseVoiceString(self.metar.wind_dir_to.string()))
+        if metar.wind_dir_from is not None:
+            metar_parts.append(f', variable between {parseVoiceString(metar.wind_dir_from.string())} '
+                               f'and {parseVoiceString(metar.wind_dir_to.string())}')
 
         # Visibility.
         # TODO: implement directions
-        self.metar_voice = '{}, visibility {}'.format(self.metar_voice, self.metar.vis.string())
+        metar_parts.append(f', visibility {metar.vis.string()}')
 
         # runway visual range
-        rvr = self.metar.runway_visual_range().replace(';', ',')
+        rvr = metar.runway_visual_range().replace(';', ',')
         if rvr:
-            rvr_new = ''
-            last_end = 0
-            rvr_pattern = re.compile(r'[0123]\d[LCR]?(?=,)')
-            for ma in rvr_pattern.finditer(rvr):
-                rwy_raw = rvr[ma.start():ma.end()]
-                rwy_str = parseVoiceInt(rwy_raw[0:2])
-                if len(rwy_raw) > 2:
-                    if rwy_raw[2] == 'L':
-                        rwy_str = '{} left'.format(rwy_str)
-                    elif rwy_raw[2] == 'C':
-                        rwy_str = '{} center'.format(rwy_str)
-                    elif rwy_raw[2] == 'R':
-                        rwy_str = '{} right'.format(rwy_str)
-                rvr_new = '{}{}{}'.format(rvr_new, rvr[last_end:ma.start()], rwy_str)
-                last_end = ma.end()
-
-            rvr_new = '{}{}'.format(rvr_new, rvr[last_end:])
-
-            self.metar_voice = '{}, visual range {}'.format(self.metar_voice, rvr_new)
+            rvr_new = RVR_RE.sub(parse_voice_rvr_rwy, rvr)
+
+            metar_parts.append(f', visual range {rvr_new}')
 
         # weather phenomena
-        if self.metar.weather:
-            self.metar_voice = '{}, {}'.format(self.metar_voice, self.metar.present_weather().replace(';', ','))
+        if metar.weather:
+            metar_parts.append(f", {metar.present_weather().replace(';', ',')}")
 
         # clouds
-        if self.metar.sky:
-            self.metar_voice = '{}, {}'.format(self.metar_voice,
-                                               self.metar.sky_conditions(',').replace(',', ', ').replace('a few',
-                                                                                                         'few'))
-        elif 'CAVOK' in self.metar.code:
-            self.metar_voice = '{}, clouds and visibility ok'.format(self.metar_voice)
+        if metar.sky:
+            metar_parts.append(f", {metar.sky_conditions(',').replace(',', ', ').replace('a few', 'few')}")
+        elif 'CAVOK' in metar.code:
+            metar_parts.append(', clouds and visibility ok')
 
         # runway condition
         # TODO: Implement runway conditions
         # Not implemented in python-metar
 
         # temperature
-        temp_value = parseVoiceInt(str(int(self.metar.temp._value)))
-        if self.metar.temp._units == 'C':
+        temp_value = parseVoiceInt(str(int(temp._value)))
+        if temp._units == 'C':
             temp_unit = 'degree Celsius'
         else:
             temp_unit = 'degree Fahrenheit'
 
-        self.metar_voice = '{}, temperature {} {}'.format(self.metar_voice, temp_value, temp_unit)
+        metar_parts.append(f', temperature {temp_value} {temp_unit}')
 
         # dew point
-        dewpt_value = parseVoiceInt(str(int(self.metar.dewpt._value)))
-        if self.metar.dewpt._units == 'C':
+        dewpt_value = parseVoiceInt(str(int(dewpt._value)))
+        if dewpt._units == 'C':
             dewpt_unit = 'degree Celsius'
         else:
             dewpt_unit = 'degree Fahrenheit'
 
-        self.metar_voice = '{}, dew point {} {}'.format(self.metar_voice, dewpt_value, dewpt_unit)
+        metar_parts.append(f', dew point {dewpt_value} {dewpt_unit}')
 
         # QNH
-        if self.metar.press._units == 'MB':
-            press_value = parseVoiceInt(str(int(self.metar.press._value)))
-            self.metar_voice = '{}, Q N H {} hectopascal'.format(self.metar_voice, press_value)
+        if press._units == 'MB':
+            press_value = parseVoiceInt(str(int(press._value)))
+            metar_parts.append(f', Q N H {press_value} hectopascal')
         else:
-            self.metar_voice = '{}, Altimeter {}'.format(self.metar_voice, parseVoiceString(self.metar.press.string()))
+            metar_parts.append(f', Altimeter {parseVoiceString(press.string())}')
 
         # TODO: implement trend
-        self.metar_voice = f'{self.metar_voice},'
+        metar_parts.append(',')
+        self.metar_voice = ''.join(metar_parts)
 
     # Generate a string of the information identifier for voice generation.
     def parse_voice_information(self):
@@ -687,7 +883,7 @@ class VoiceAtis(object):
                 info_line = self.atis_raw[1]
 
             # Get report time.
-            time_match = re.search(r'\d{4}z', info_line)
+            time_match = REPORT_TIME_RE.search(info_line)
             if time_match is not None:
                 start_ind = time_match.start()
                 end_ind = time_match.end() - 1
@@ -702,8 +898,8 @@ class VoiceAtis(object):
             # information_index = words_list.index('information')
             # airport_name = ' '.join(words_list[:information_index - 1])
 
-            self.information_voice = f'{airport_name} information {self.information_identifier}'
-            self.information_voice += f', met report time {time_str},'
+            self.information_voice = (f'{airport_name} information {self.information_identifier}, '
+                                      f'met report time {time_str},')
 
         # IvAc 2
         else:
@@ -717,28 +913,25 @@ class VoiceAtis(object):
 
     # Generate a string of the runway information for voice generation.
     def parse_voice_rwy(self):
-        self.rwy_voice = ''
+        rwy_parts = []
         arr_dep = ['Arrival', 'Departure']
 
         # ARR, DEP
         for k in [0, 1]:
             if self.rwy_information[k] is not None:
-                self.rwy_voice = '{}{} runway '.format(self.rwy_voice, arr_dep[k])
-                for m in self.rwy_information[k]:
-                    if len(m) > 2:
-                        self.rwy_voice = '{}{} {}, and '.format(self.rwy_voice, parseVoiceInt(m[0:2]), RWY_TABLE[m[2]])
-                    else:
-                        self.rwy_voice = '{}{}, and '.format(self.rwy_voice, parseVoiceInt(m))
+                runways = [parse_voice_rwy_designator(m) for m in self.rwy_information[k]]
 
-                self.rwy_voice = self.rwy_voice[:-6] + ', '
+                rwy_parts.append(f"{arr_dep[k]} runway {', and '.join(runways)}, ")
 
         # TRL
         if self.rwy_information[2] is not None:
-            self.rwy_voice = '{}Transition altitude {} feet, '.format(self.rwy_voice, self.rwy_information[2])
+            rwy_parts.append(f'Transition altitude {self.rwy_information[2]} feet, ')
 
         # TA
         if self.rwy_information[3] is not None:
-            self.rwy_voice = f'{self.rwy_voice}Transition level {parseVoiceInt(self.rwy_information[3])},'
+            rwy_parts.append(f'Transition level {parseVoiceInt(self.rwy_information[3])},')
+
+        self.rwy_voice = ''.join(rwy_parts)
 
     # Generate a string of ATIS comment for voice generation.
     def parse_voice_comment(self):
@@ -758,28 +951,33 @@ class VoiceAtis(object):
         # Log ATIS text.
         try:
             self.logger.info('ATIS Text is: {}'.format(self.atis_voice))
-        except:
-            # TODO: Fix too broad except.
+        except (UnicodeError, ValueError):
             self.logger.info('ATIS Text cannot be displayed: unexpected characters.')
 
         # Create tmp folder.
         if not os.path.isdir('tmp'):
             os.mkdir('tmp')
 
-        # Get tmp name.
-        file_count = 0
-        file_tmp = 'tmp/atis_0.wav'
-        while os.path.isfile(file_tmp):
-            file_count += 1
-            file_tmp = 'tmp/atis_{}.wav'.format(file_count)
+        # Get tmp name from the ATIS text. Same text results in the same file.
+        voice_hash = hashlib.blake2b(self.atis_voice.encode(ENCODING_TYPE), digest_size=8).hexdigest()
+        file_tmp = 'tmp/atis_{}.wav'.format(voice_hash)
+
+        if voice_hash in self.wav_cache and os.path.isfile(file_tmp):
+            self.logger.info('ATIS unchanged, using existing sound.')
+            self.wav_cache.move_to_end(voice_hash)
+        else:
+            # Create tmp wav file.
+            self.logger.info('Generating ATIS sound.')
+            self.engine.create_recording('tmp/atis_raw.wav', self.atis_voice)
 
-        # Create tmp wav file.
-        self.logger.info('Generating ATIS sound.')
-        self.engine.create_recording(file_tmp, self.atis_voice)
+            # Apply radio effect.
+            self.logger.info('Generating radio effects.')
+            AudioEffect.radio('tmp/atis_raw.wav', file_tmp)
 
-        # Apply radio effect.
-        self.logger.info('Generating radio effects.')
-        AudioEffect.radio(file_tmp, file_tmp)
+            # Remember the file. Forget the oldest one if the cache is full.
+            self.wav_cache[voice_hash] = file_tmp
+            if len(self.wav_cache) > self.WAV_CACHE_SIZE:
+                self.wav_cache.popitem(last=False)
 
         # Get wav duration.
         with contextlib.closing(wave.open(file_tmp, 'r')) as f:
@@ -792,20 +990,29 @@ class VoiceAtis(object):
         self.logger.info('Start reading.')
         mixer.music.play()
 
-        while mixer.music.get_busy():
-            self.onWord()
-            tmpfiles = os.listdir('tmp')
-            for k in tmpfiles:
-                full_path = 'tmp/' + k
-                if full_path != file_tmp:
-                    try:
-                        os.remove(full_path)
-                    except:
-                        pass
+        # Remove old files once the previous file is released by the mixer.
+        self.clean_tmp()
+
+        get_busy = mixer.music.get_busy
+        on_word = self.onWord
+        while get_busy():
+            on_word()
             time.sleep(0.5)
 
         self.logger.info('Reading finished.')
 
+    # Remove files in tmp folder which are not in the wav cache.
+    def clean_tmp(self):
+        keep_files = set(self.wav_cache.values())
+        for k in os.listdir('tmp'):
+            full_path = 'tmp/' + k
+            if full_path not in keep_files:
+                try:
+                    os.remove(full_path)
+                except OSError:
+                    # Still in use, removed at a later reading.
+                    pass
+
     # Callback for stop of reading.
     # Stops reading if frequency change/com deactivation/out of range.
     def onWord(self):
@@ -831,39 +1038,30 @@ class VoiceAtis(object):
 
         # frequency
         # TODO: Check 8.33 kHz. (125.205 = 125.200)
-        hex_code = hex(results[0])[2:]
-        self.com1frequency = float('1{}.{}'.format(hex_code[0:2], hex_code[2:]))
-        hex_code = hex(results[1])[2:]
-        self.com2frequency = float('1{}.{}'.format(hex_code[0:2], hex_code[2:]))
-        hex_code = hex(results[5])[2:]
-        self.nav1frequency = float('1{}.{}'.format(hex_code[0:2], hex_code[2:]))
-        hex_code = hex(results[6])[2:]
-        self.nav2frequency = float('1{}.{}'.format(hex_code[0:2], hex_code[2:]))
+        self.com1frequency = bcd_to_frequency(results[0])
+        self.com2frequency = bcd_to_frequency(results[1])
+        self.nav1frequency = bcd_to_frequency(results[5])
+        self.nav2frequency = bcd_to_frequency(results[6])
 
         # radio active
         # TODO: Test accuracy of this data (with various planes and sims)
-        radio_active_bits = list(map(int, '{0:08b}'.format(results[2])))
-        if radio_active_bits[2]:
+        # Bits from most significant: COM1, COM2, COM both, NAV1, NAV2.
+        radio_active = results[2] & 0xFF
+        if radio_active & 0x20:
             self.com1active = True
             self.com2active = True
-        elif radio_active_bits[0]:
+        elif radio_active & 0x80:
             self.com1active = True
             self.com2active = False
-        elif radio_active_bits[1]:
+        elif radio_active & 0x40:
             self.com1active = False
             self.com2active = True
         else:
             self.com1active = False
             self.com2active = False
 
-        if radio_active_bits[3]:
-            self.nav1active = True
-        else:
-            self.nav1active = False
-        if radio_active_bits[4]:
-            self.nav2active = True
-        else:
-            self.nav2active = False
+        self.nav1active = bool(radio_active & 0x10)
+        self.nav2active = bool(radio_active & 0x08)
 
         # lat lon
         self.lat = results[3] * (90.0 / (10001750.0 * 65536.0 * 65536.0))
@@ -919,15 +1117,31 @@ class VoiceAtis(object):
             frequencies.append(self.nav2frequency)
 
         if frequencies:
-            distance_min = self.RADIO_RANGE + 1
-            for ap in self.airport_infos:
-                distance = gcDistanceNm(self.lat, self.lon, self.airport_infos[ap][1], self.airport_infos[ap][2])
-                if distance < self.RADIO_RANGE and distance < distance_min:
-                    for fr in self.airport_infos[ap][0]:
-                        if (floor(fr * 100) / 100) in frequencies:
-                            distance_min = distance
-                            self.airport = ap
-                            break
+            # Get airports with a matching frequency.
+            candidates = set()
+            for fr in frequencies:
+                candidates.update(self.freq_to_airports.get(fr, ()))
+            if not candidates:
+                return
+            candidates = np.fromiter(sorted(candidates), dtype=np.intp, count=len(candidates))
+
+            # Choose the nearest candidate in range.
+            distances = gc_distance_nm_vec(self.lat, self.lon, self.ap_lat[candidates], self.ap_lon[candidates])
+            nearest = np.argmin(distances)
+            if distances[nearest] < self.RADIO_RANGE:
+                self.airport = self.ap_codes[candidates[nearest]]
+
+    # Store airport data as arrays for the vectorized search in get_airport.
+    # Frequencies are quantized once and map to the set of airport indices using them.
+    def build_airport_arrays(self):
+        self.ap_codes = list(self.airport_infos.keys())
+        self.ap_lat = np.array([ap_info[1] for ap_info in self.airport_infos.values()], dtype=np.float64)
+        self.ap_lon = np.array([ap_info[2] for ap_info in self.airport_infos.values()], dtype=np.float64)
+
+        self.freq_to_airports = {}
+        for k, ap_info in enumerate(self.airport_infos.values()):
+            for fr in ap_info[0]:
+                self.freq_to_airports.setdefault(floor(fr * 100) / 100, set()).add(k)
 
     # Read data of airports from a given file.
     def get_airport_data_file(self, ap_file):
@@ -939,48 +1153,102 @@ class VoiceAtis(object):
         # Read the file.
         with open(ap_file, encoding="utf8") as aptInfoFile:
             for li in aptInfoFile:
-                line_split = re.split('[,;]', li)
-                if not li.startswith('#') and len(line_split) == 5:
-                    freq_str = line_split[1].split('^')
-                    freq_list = []
-                    for fr in freq_str:
-                        freq_list.append(float(fr))
+                if li.startswith('#'):
+                    continue
+                line_split = AIRPORT_FILE_SPLIT_RE.split(li.rstrip('\n'))
+                if len(line_split) == 5:
                     self.airport_infos[line_split[0].strip()] = (
-                        freq_list, float(line_split[2]), float(line_split[3]), line_split[4].replace('\n', ''))
+                        [float(fr) for fr in line_split[1].split('^')], float(line_split[2]), float(line_split[3]),
+                        line_split[4])
+
+    # Read airports.info, from its pickle cache if that is still valid.
+    def get_airport_data_info(self):
+        if not self.get_airport_data_cache():
+            ap_info_path = os.path.join(self.rootDir, 'supportFiles', 'airports.info')
+            self.get_airport_data_file(ap_info_path)
+            if os.path.isfile(ap_info_path):
+                self.write_airport_data_cache()
+
+    # Read airport data from the pickle cache of airports.info.
+    # Returns False if the cache is missing, older than airports.info or from another download.
+    def get_airport_data_cache(self):
+        cache_path = os.path.join(self.rootDir, 'supportFiles', 'airports.pickle')
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(
+                    os.path.join(self.rootDir, 'supportFiles', 'airports.info')):
+                return False
+            with open(cache_path, 'rb') as cacheFile:
+                cache = pickle.load(cacheFile)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+
+        if cache.get('validators') != self.ini_options.get('ourAirportsValidators'):
+            return False
+        self.airport_infos = cache['airport_infos']
+        return True
+
+    # Write airport data to the pickle cache of airports.info.
+    # Valid as long as airports.info is not newer and the validators of the download match.
+    # Failing to write is not fatal, airports.info is parsed again at the next start.
+    def write_airport_data_cache(self):
+        cache_path = os.path.join(self.rootDir, 'supportFiles', 'airports.pickle')
+        try:
+            with open(cache_path + '.tmp', 'wb') as cacheFile:
+                pickle.dump({'airport_infos': self.airport_infos,
+                             'validators': self.ini_options.get('ourAirportsValidators')},
+                            cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_path + '.tmp', cache_path)
+        except OSError as e:
+            self.logger.warning('Unable to write airport data cache. Error: {!r}'.format(e))
 
     # Read data of airports from http://ourairports.com.
+    # Returns False if the data did not change since the last download.
     def get_airport_data_web(self):
         airport_freqs = {}
 
-        # Read the file with frequency.
-        response = urllib.request.urlopen(self.OUR_AIRPORTS_URL + 'airport-frequencies.csv')
-        data = response.read()
-        ap_freq_text = data.decode(ENCODING_TYPE)
-
-        # Get the frequencies from the file.
-        for li in ap_freq_text.split('\n'):
-            line_split = li.split(',')
-            if len(line_split) > 3 and line_split[3] == '"ATIS"':
-                airport_code = line_split[2].replace('"', '')
-                if airport_code not in airport_freqs:
-                    airport_freqs[airport_code] = [float(line_split[-1].replace('\n', ''))]
-                else:
-                    airport_freqs[airport_code].append(float(line_split[-1].replace('\n', '')))
-
-        # Read the file with other airport data.
-        response = urllib.request.urlopen(self.OUR_AIRPORTS_URL + 'airports.csv')
-        data = response.read()
-        ap_text = data.decode(ENCODING_TYPE)
+        # Get validators of last download. Only usable if the resulting airports.info is still present.
+        validators = {}
+        if os.path.isfile(os.path.join(self.rootDir, 'supportFiles', 'airports.info')):
+            validators = json.loads(self.ini_options.get('ourAirportsValidators', '{}'))
 
-        # Add frequency and write them to self. airportInfos.
-        for li in ap_text.split('\n'):
-            line_split = re.split(",(?=(?:[^\"]*\"[^\"]*\")*[^\"]*$)", li)
+        # Check if any of the files changed.
+        file_names = ['airport-frequencies.csv', 'airports.csv']
+        responses = [self.urlopen_conditional(self.OUR_AIRPORTS_URL + fn, validators.setdefault(fn, {}))
+                     for fn in file_names]
+        if all(rs is None for rs in responses):
+            return False
 
-            if len(line_split) > 1:
-                ap_code = line_split[1].replace('"', '')
-                if ap_code in airport_freqs and len(ap_code) <= 4:
-                    self.airport_infos[ap_code] = [airport_freqs[ap_code], float(line_split[4]), float(line_split[5]),
-                                                   line_split[3].replace('"', '')]
+        # Get the complete data of unchanged files.
+        for k, fn in enumerate(file_names):
+            if responses[k] is None:
+                responses[k] = urllib.request.urlopen(self.OUR_AIRPORTS_URL + fn, timeout=URL_TIMEOUT)
+
+        # Get the frequencies from the file, parsed while downloading.
+        with responses[0] as response:
+            for line_split in csv.reader(io.TextIOWrapper(io.BufferedReader(response, IO_BUFFER_SIZE),
+                                                          encoding=ENCODING_TYPE, newline='')):
+                if len(line_split) > 3 and line_split[3] == 'ATIS':
+                    airport_code = line_split[2]
+                    if airport_code not in airport_freqs:
+                        airport_freqs[airport_code] = [float(line_split[-1])]
+                    else:
+                        airport_freqs[airport_code].append(float(line_split[-1]))
+
+        # Add frequency and write them to self. airportInfos.
+        with responses[1] as response:
+            for line_split in csv.reader(io.TextIOWrapper(io.BufferedReader(response, IO_BUFFER_SIZE),
+                                                          encoding=ENCODING_TYPE, newline='')):
+                if len(line_split) > 1:
+                    ap_code = line_split[1]
+                    if ap_code in airport_freqs and len(ap_code) <= 4:
+                        self.airport_infos[ap_code] = [airport_freqs[ap_code], float(line_split[4]),
+                                                       float(line_split[5]), line_split[3]]
+
+        # Keep validators for the next download. Written with the ini.
+        for fn, response in zip(file_names, responses):
+            self.store_validators(response, validators[fn])
+        self.ini_options['ourAirportsValidators'] = json.dumps(validators)
+        return True
 
     # Reads airportData from two sources.
     def get_airport_data(self):
@@ -988,72 +1256,120 @@ class VoiceAtis(object):
 
         # Check update date of airport data.
         # Airport data only have to be downloaded once a day.
-        if 'lastAirportDownload' in self.ini_options:
-            if self.ini_options['lastAirportDownload'] == datetime.today().strftime('%d%m%y'):
-                self.logger.info('Airport data up to date.')
-                self.get_airport_data_file(os.path.join(self.rootDir, 'supportFiles', 'airports.info'))
-                return
+        today = datetime.today().strftime('%d%m%y')
+        if self.ini_options.get('lastAirportDownload') == today:
+            self.logger.info('Airport data up to date.')
+            self.get_airport_data_info()
+            return
 
         try:
             # Try to read airport data from web.
             self.logger.info('Downloading airport data. This may take some time.')
-            self.get_airport_data_web()
+            if self.get_airport_data_web():
+                self.logger.info('Finished downloading airport data.')
+            else:
+                # Nothing changed on the web, start from airports.info.
+                self.logger.info('Airport data not modified since last download.')
+                self.get_airport_data_info()
+
+            # Data of airports_add.info has priority over data from the web. Apply it on every refresh.
             self.get_airport_data_file(os.path.join(self.rootDir, 'supportFiles', 'airports_add.info'))
-            collected_from_web = True
-            self.logger.info('Finished downloading airport data.')
+            update_airport_info = True
 
-        except:
+        except (OSError, http.client.HTTPException, csv.Error, ValueError, IndexError) as e:
             # If this fails, use the airports from airports.info.
-            self.logger.warning(
-                'Unable to get airport data from web. Using airports.info. Error: {}'.format(sys.exc_info()[0]))
+            # OSError includes URLError and socket timeouts. csv.Error, ValueError and IndexError are malformed csv.
+            self.logger.warning('Unable to get airport data from web. Using airports.info. Error: {!r}'.format(e))
             self.airport_infos = {}
-            collected_from_web = False
+            update_airport_info = False
             try:
-                self.get_airport_data_file(os.path.join(self.rootDir, 'supportFiles', 'airports.info'))
-            except:
+                self.get_airport_data_info()
+            except (OSError, ValueError, IndexError):
                 self.logger.error('Unable to read airport data from airports.info!')
 
-        # Sort airportInfos and write them to a file for future use if collected from web.
-        if collected_from_web:
+        # Sort airportInfos and write them to a file for future use if refreshed.
+        if update_airport_info:
             ap_info_path = os.path.join(self.rootDir, 'supportFiles', 'airports.info')
-            ap_list = list(self.airport_infos.keys())
-            ap_list.sort()
-            with open(ap_info_path, 'w', encoding=ENCODING_TYPE) as apDataFile:
-                for ap in ap_list:
-                    freq_str = ''
-                    for fr in self.airport_infos[ap][0]:
-                        freq_str = '{}{}^'.format(freq_str, fr)
-                    apDataFile.write('{:>4}; {:20}; {:11.6f}; {:11.6f}; {}\n'.format(ap, freq_str.strip('^'),
-                                                                                     self.airport_infos[ap][1],
-                                                                                     self.airport_infos[ap][2],
-                                                                                     self.airport_infos[ap][3]))
-
-            self.ini_options['lastAirportDownload'] = datetime.today().strftime('%d%m%y')
+            ap_list = sorted(self.airport_infos)
+            lines = []
+            for ap in ap_list:
+                ap_info = self.airport_infos[ap]
+                lines.append(AIRPORT_INFO_FORMAT(ap, '^'.join(map(str, ap_info[0])), ap_info[1], ap_info[2],
+                                                 ap_info[3]))
+
+            # Write all lines at once to a temporary file and replace, so airports.info is never left half written.
+            with open(ap_info_path + '.tmp', 'w', encoding=ENCODING_TYPE, buffering=IO_BUFFER_SIZE) as apDataFile:
+                apDataFile.write(''.join(lines))
+            os.replace(ap_info_path + '.tmp', ap_info_path)
+
+            self.write_airport_data_cache()
+
+            self.ini_options['lastAirportDownload'] = today
             self.write_ini()
 
     # Determines the info identifier of the loaded ATIS.
     def get_info_identifier(self):
-        if self.client_type == 'ivac1':
-            information_pos = re.search('information ', self.atis_raw[1].lower()).end()
-            information_split = self.atis_raw[1][information_pos:].split(' ')
-            self.information_identifier = information_split[0]
-        elif self.client_type == 'aurora':
-            information_pos = re.search('information ', self.atis_raw[2].lower()).end()
-            information_split = self.atis_raw[2][information_pos:].split(' ')
-            self.information_identifier = information_split[0]
+        if self.client_type in ['ivac1', 'aurora']:
+            # Select line of information.
+            if self.client_type == 'ivac1':
+                info_line = self.atis_raw[1]
+            else:
+                info_line = self.atis_raw[2]
+
+            # Find the literal prefix without the regex engine.
+            # Lowered as ASCII bytes, non-ASCII chars become '?' so the positions match info_line.
+            information_pos = info_line.encode('ascii', 'replace').lower().find(b'information')
+            if information_pos == -1:
+                self.information_identifier = ''
+                return
+            information_pos += len('information')
+
+            # Skip whitespace and take the following word.
+            while information_pos < len(info_line) and info_line[information_pos].isspace():
+                information_pos += 1
+            self.information_identifier = info_line[information_pos:].split(' ')[0]
         else:
-            self.information_identifier = CHAR_TABLE[re.findall(r'(?<=ATIS )[A-Z](?= \d{4})', self.atis_raw[1])[0]]
+            self.information_identifier = CHAR_TABLE[ATIS_LETTER_RE.search(self.atis_raw[1]).group()]
 
     # Retrieves the metar of an airport independent of an ATIS.
+    # Metars downloaded in the last METAR_INTERVAL seconds are reused per airport.
     def get_airport_metar(self):
-        response = urllib.request.urlopen(self.NOAA_METAR_URL.replace('<station>', self.airport))
-        data = response.read()
-        metar_text = data.decode(ENCODING_TYPE)
-
-        # Split at newline.
-        metar_text_split = metar_text.split('\n')
-
-        return metar_text_split[1]
+        cached = self.metar_cache.get(self.airport)
+        if cached is not None and time.monotonic() - cached[0] < self.METAR_INTERVAL:
+            return cached[1]
+
+        metar_string = self.download_airport_metar(self.airport)
+        if metar_string is not None:
+            self.metar_cache[self.airport] = (time.monotonic(), metar_string)
+        return metar_string
+
+    # Downloads the metar of the given airport.
+    # Returns None if the station file contains no metar.
+    def download_airport_metar(self, airport):
+        # Conditional GET, the last metar is reused if the station file did not change.
+        response = self.urlopen_conditional(self.NOAA_METAR_URL.replace('<station>', airport),
+                                            self.metar_validators.setdefault(airport, {}))
+        if response is None:
+            return self.metar_strings[airport]
+
+        with response:
+            # First line is the observation time, second line the metar.
+            data = response.read(2 * METAR_MAX_LEN)
+
+        # Find the metar line on the raw bytes, only that line is decoded.
+        start = data.find(airport.encode('ascii'), data.find(b'\n') + 1)
+        if start == -1:
+            self.logger.warning(f'No metar line for {airport}.')
+            return None
+        end = data.find(b'\n', start)
+        if end == -1:
+            end = len(data)
+        metar_string = data[start:end].decode(ENCODING_TYPE).rstrip('\r')
+
+        # Only a metar that was read completely is reused on HTTP 304.
+        self.metar_strings[airport] = metar_string
+        self.store_validators(response, self.metar_validators.setdefault(airport, {}))
+        return metar_string
 
     # Get information from voiceAtis.ini file.
     # File is created if it doesn't exist.
@@ -1061,18 +1377,28 @@ class VoiceAtis(object):
         self.ini_options = {}
         if os.path.isfile('voiceAtis.ini'):
             with open('voiceAtis.ini') as iniFile:
-                ini_content = iniFile.readlines()
-            for k in ini_content:
-                line = k.split('=')
-                self.ini_options[line[0].strip()] = line[1].strip()
+                for line in iniFile:
+                    key, sep, value = line.partition('=')
+                    if sep:
+                        self.ini_options[key.strip()] = value.strip()
         else:
             self.write_ini()
 
     # Write information to voiceAtis.ini
+    # Skipped if the content did not change since the last write.
     def write_ini(self):
-        with open('voiceAtis.ini', 'w') as iniFile:
-            for k in self.ini_options:
-                iniFile.write('{}={}\n'.format(k, self.ini_options[k]))
+        # Compare the options themselves, the text is only built if they changed.
+        ini_items = tuple(self.ini_options.items())
+        if ini_items == self.last_ini_items and os.path.isfile('voiceAtis.ini'):
+            return
+
+        ini_text = ''.join(['{}={}\n'.format(k, v) for k, v in ini_items])
+
+        # Write to a temporary file first and replace, so the ini is never left half written.
+        with open('voiceAtis.ini.tmp', 'w') as iniFile:
+            iniFile.write(ini_text)
+        os.replace('voiceAtis.ini.tmp', 'voiceAtis.ini')
+        self.last_ini_items = ini_items
 
 
 if __name__ == '__main__':
@@ -22,9 +22,13 @@ import re
 from tkinter import Tk, Button, Entry, Label, Radiobutton, StringVar, Text
 from voiceAtis import VoiceAtis
 
+# Chars removed from the airport entry.
+AIRPORT_ENTRY_RE = re.compile(r'[\W]')
+
 
 class VoiceAtisGUI(object):
     STEP_INTERVAL = 25
+    IDLE_STEP_INTERVAL = 200
 
     def __init__(self):
         # Init attributes.
@@ -53,6 +57,8 @@ class VoiceAtisGUI(object):
 
         # Other attributes.
         self.fsuipc_connected = False
+        self.inputs_changed = True
+        self.frequency_airport = (None, None)
 
         # Init voice ATIS.
         self.voice_atis = VoiceAtis()
@@ -69,6 +75,7 @@ class VoiceAtisGUI(object):
         # Init variables.
         self.source = StringVar()
         self.source.set('Airport')
+        self.source.trace_add('write', self.cb_inputs)
 
         # Init gui elements.
         row = 0
@@ -90,6 +97,7 @@ class VoiceAtisGUI(object):
 
         row += 1
         self.v_frequency = StringVar()
+        self.v_frequency.trace_add('write', self.cb_inputs)
         self.r_frequency = Radiobutton(text='Frequency', variable=self.source, value='frequency',
                                        command=self.cb_radiobuttons)
         self.r_frequency.grid(row=row, column=0, sticky='W')
@@ -110,28 +118,60 @@ class VoiceAtisGUI(object):
         self.master.mainloop()
 
     def step(self):
+        # Only resolve the airport again if the inputs changed. Sim data may change anytime.
+        source = self.source.get()
+        if source == 'sim' or self.inputs_changed:
+            self.inputs_changed = False
+            self.update_airport(source)
+
+        # Check if an airport was found. Otherwise end the step and check again later.
+        if self.voice_atis.airport is None:
+            self.master.after(self.IDLE_STEP_INTERVAL, self.step)
+            return
+
+        # Set entry to airport chosen.
+        if self.v_airport.get() != self.voice_atis.airport:
+            self.v_airport.set(self.voice_atis.airport)
+
+        # Get atis voice. Check again later if there is nothing to read.
+        if not self.voice_atis.get_atis_from_airport():
+            self.master.after(self.IDLE_STEP_INTERVAL, self.step)
+            return
+
+        # Read the string.
+        self.voice_atis.read_voice()
+
+        # Schedule next step execution.
+        self.master.after(self.STEP_INTERVAL, self.step)
+
+    # Determine the airport of voice_atis from the chosen source.
+    def update_airport(self, source):
         # Check and get airport.
-        if self.source.get() == 'airport':
+        if source == 'airport':
             # Get airport from Entry and send to voice_atis.
             airport_entry = self.v_airport.get()
-            if airport_entry in self.voice_atis.airport_infos:
-                self.voice_atis.airport = airport_entry
-            else:
-                self.voice_atis.airport = None
+            self.voice_atis.airport = airport_entry if airport_entry in self.voice_atis.airport_infos else None
+
+        elif source == 'frequency':
+            # Reuse the airport of an unchanged frequency entry and position.
+            frequency_key = (self.v_frequency.get(), self.voice_atis.lat, self.voice_atis.lon)
+            if frequency_key == self.frequency_airport[0]:
+                self.voice_atis.airport = self.frequency_airport[1]
+                return
 
-        elif self.source.get() == 'frequency':
             # Get frequency from entry.
             try:
-                self.voice_atis.com1frequency = float(self.v_frequency.get())
+                self.voice_atis.com1frequency = float(frequency_key[0])
             except ValueError:
-                self.master.after(self.STEP_INTERVAL, self.step)
+                self.voice_atis.airport = None
                 return
             # Set com1 in voice_atis (not in sim) to active to read from it.
             self.voice_atis.com1active = True
             # Get airport from frequency.
             self.voice_atis.get_airport()
+            self.frequency_airport = (frequency_key, self.voice_atis.airport)
 
-        elif self.source.get() == 'sim':
+        elif source == 'sim':
             # Check if FSUIPC is still connected and get pyuipc data.
             if self.voice_atis.fsuipc_connection is None:
                 self.l_connected.config(text='Connected', bg='red', fg='white')
@@ -142,23 +182,6 @@ class VoiceAtisGUI(object):
             self.voice_atis.get_fsuipc_data()
             self.voice_atis.get_airport()
 
-        # Check if an airport was found. Otherwise end the step.
-        if self.voice_atis.airport is None:
-            self.master.after(self.STEP_INTERVAL, self.step)
-            return
-
-        # Set entry to airport chosen.
-        self.v_airport.set(self.voice_atis.airport)
-
-        # Get atis voice.
-        self.voice_atis.get_atis_from_airport()
-
-        # Read the string.
-        self.voice_atis.read_voice()
-
-        # Schedule next step execution.
-        self.master.after(self.STEP_INTERVAL, self.step)
-
     def cb_b_connect(self):
         fsuipc_connected = self.voice_atis.connect_fsuipc()
 
@@ -182,7 +205,7 @@ class VoiceAtisGUI(object):
         current_content = self.v_airport.get()
 
         # Replace wrong chars.
-        new_content = re.sub(r'[\W]', '', current_content).upper()
+        new_content = AIRPORT_ENTRY_RE.sub('', current_content).upper()
 
         # Cut to 4 chars.
         if len(new_content) > 4:
@@ -191,6 +214,11 @@ class VoiceAtisGUI(object):
         # Write adjusted string to entry.
         self.v_airport.set(new_content)
         self.e_airport.update()
+        self.inputs_changed = True
+
+    def cb_inputs(self, *args):
+        # Mark inputs to be evaluated at the next step.
+        self.inputs_changed = True
 
 
 if __name__ == '__main__':
@@ -35,6 +35,15 @@ RWY_TABLE = {'R' : 'right',
              'C' : 'center',
              'L' : 'left'}
 
+# Number patterns for parseVoiceString().
+FLOAT_RE = re.compile(r'\d+[,.]\d+')
+INT_RE = re.compile(r'\d\d+')
+
+# Translation tables for the parseVoice* functions.
+INT_TRANS = str.maketrans({'-': 'minus'})
+FLOAT_TRANS = str.maketrans({'-': 'minus', '.': 'decimal', ',': 'decimal'})
+CHAR_TRANS = str.maketrans(CHAR_TABLE)
+
 ## Sperates integer Numbers with whitespace
 # Needed for voice generation to be pronounced properly.
 # Also replaces - by 'minus'
@@ -45,13 +54,7 @@ def parseVoiceInt(number):
     if isinstance(number, int):
         number = str(number)
     
-    numberSep = ''
-    for k in number:
-        if k != '-':
-            numberSep = '{}{} '.format(numberSep,k)
-        else:
-            numberSep = '{}minus '.format(numberSep)
-    return numberSep.strip()
+    return ' '.join(number).translate(INT_TRANS).strip()
 
 ## Sperates decimal Numbers with whitespace
 # Also replaces . or , by 'decimal'
@@ -61,40 +64,19 @@ def parseVoiceFloat(number):
     if isinstance(number, float):
         number = str(number)
     
-    numberSep = ''
-    for k in number:
-        if k != '.' and k != ',' and k!= '-':
-            numberSep = '{}{} '.format(numberSep,k)
-        elif k != '-':
-            numberSep = '{}decimal '.format(numberSep)
-        else:
-            numberSep = '{}minus '.format(numberSep)
-    return numberSep.strip()
+    return ' '.join(number).translate(FLOAT_TRANS).strip()
 
 ## Search a string for numbers and seperate with whitespaces.
 # Using parseVoiceInt() and parseVoiceFloat().
 def parseVoiceString(string):
-    pattern = re.compile('\d+[,.]\d+')
-    match = pattern.search(string)
-    while match is not None:
-        replaceStr = parseVoiceFloat(string[match.start():match.end()])
-        string = '{}{}{}'.format(string[0:match.start()],replaceStr,string[match.end():])
-        match = pattern.search(string)
-        
-    pattern = re.compile('\d\d+')
-    match = pattern.search(string)
-    while match is not None:
-        replaceStr = parseVoiceInt(string[match.start():match.end()])
-        string = '{}{}{}'.format(string[0:match.start()],replaceStr,string[match.end():])
-        match = pattern.search(string)
-        
-    return string
+    # Repeat until stable, separated digits may form new matches (12,34,56).
+    stringSep = FLOAT_RE.sub(lambda m: parseVoiceFloat(m.group()), string)
+    while stringSep != string:
+        string = stringSep
+        stringSep = FLOAT_RE.sub(lambda m: parseVoiceFloat(m.group()), string)
+
+    return INT_RE.sub(lambda m: parseVoiceInt(m.group()), string)
 
 ## Splits a string at each char and replaces them with ICAO-alphabet.
 def parseVoiceChars(string):
-        
-    stringSep = ''
-    for k in string:
-        stringSep = '{}{} '.format(stringSep,CHAR_TABLE[k])
-    
-    return stringSep.strip()
\ No newline at end of file
+    return ' '.join(string).translate(CHAR_TRANS).strip()